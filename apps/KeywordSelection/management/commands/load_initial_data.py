@@ -15,16 +15,23 @@ class Command(BaseCommand):
         try:
             with open(data_file_path, 'r') as file:
                 data = json.load(file)
+                keywords = [
+                    Keyword(
+                        name=item['name'],
+                        data_type=item['data_type'],
+                        help_text=item['help_text'],
+                        extra_json=item['extra_json'] if 'extra_json' in item else {}
+                    )
+                    for item in data
+                ]
+                # Upsert every keyword in one statement instead of a SELECT + INSERT/UPDATE per row
                 with transaction.atomic():
-                    for item in data:
-                        keyword, created = Keyword.objects.update_or_create(
-                            name=item['name'],
-                            defaults={
-                                'data_type': item['data_type'],
-                                'help_text': item['help_text'],
-                                'extra_json': item['extra_json'] if 'extra_json' in item else {}
-                            }
-                        )
+                    Keyword.objects.bulk_create(
+                        keywords,
+                        update_conflicts=True,
+                        unique_fields=['name'],
+                        update_fields=['data_type', 'help_text', 'extra_json']
+                    )
             self.stdout.write(self.style.SUCCESS('Successfully loaded initial data!'))
         except FileNotFoundError:
             self.stderr.write(self.style.ERROR(f'File not found: {data_file_path}'))
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect
 from django.views.decorators.csrf import csrf_exempt
 from django.urls import reverse
 from django.http import JsonResponse
+from django.db import transaction
 from .models import Keyword
 import json
 
@@ -10,8 +11,7 @@ def keyword_select_view(request):
     return render(request, 'KeywordSelection/keyword-selection.html')
 
 def get_keywords(request):
-    keywords = Keyword.objects.all().order_by('id')
-    keyword_list = [keyword.name for keyword in keywords]
+    keyword_list = list(Keyword.objects.order_by('id').values_list('name', flat=True))
     return JsonResponse({'keywords': keyword_list})
 
 @csrf_exempt
@@ -27,11 +27,8 @@ def submit_keyword_order(request):
             if not isinstance(ordered_keywords, list) or not all(isinstance(item, dict) for item in ordered_keywords):
                 raise ValueError("Invalid format for ordered_keywords")
 
-            # Reset all priorities to 0
-            Keyword.objects.all().update(priority=0)
-            print("All keyword priorities have been reset to 0.")
-
-            # Update priorities for provided keywords
+            # Keyed by name so a repeated keyword keeps its last priority
+            keywords = {}
             for keyword_dict in ordered_keywords:
                 name = keyword_dict.get('name')
                 priority = keyword_dict.get('priority')
@@ -39,14 +36,20 @@ def submit_keyword_order(request):
                     raise ValueError("Invalid type for name or priority in ordered_keywords")
 
                 print("Updating priority for keyword:", name, "with priority:", priority)
-                keyword, created = Keyword.objects.update_or_create(
-                    name=name,
-                    defaults={'priority': priority}
+                keywords[name] = Keyword(name=name, priority=priority)
+
+            with transaction.atomic():
+                # Reset all priorities to 0
+                Keyword.objects.all().update(priority=0)
+                print("All keyword priorities have been reset to 0.")
+
+                # Update priorities for provided keywords in a single upsert
+                Keyword.objects.bulk_create(
+                    keywords.values(),
+                    update_conflicts=True,
+                    unique_fields=['name'],
+                    update_fields=['priority']
                 )
-                if created:
-                    print(f"Keyword '{name}' was created with priority {priority}.")
-                else:
-                    print("Priority updated for keyword:", name)
 
             print("Request processed successfully.")
             return JsonResponse({'success': True, 'redirect_url': reverse('scraper')})
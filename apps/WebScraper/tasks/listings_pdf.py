@@ -1,3 +1,4 @@
+import functools
 import logging
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -22,6 +23,8 @@ logging.basicConfig(
 )
 
 
+# Styles are never mutated, so one set is shared by every PDF built in this worker
+@functools.lru_cache(maxsize=None)
 def get_custom_styles():
     logger.debug("Configuring custom styles for the PDF")
     styles = {
@@ -67,8 +70,15 @@ def generate_listing_pdf(self, sorted_properties, columns):
     completed_properties = 0
     logger.debug(f"Total properties to process: {total_properties}")
 
+    # Field names and their heading markup are the same for every property
+    field_names = [col[0] for col in columns]
+    headings = {
+        name: f"<para style='heading'>{name.replace('_', ' ').title()}:</para>"
+        for name in field_names
+    }
+
     for count, property_tuple in enumerate(sorted_properties, start=1):
-        property_dict = dict(zip([col[0] for col in columns], property_tuple))
+        property_dict = dict(zip(field_names, property_tuple))
 
         if not isinstance(property_dict, dict):
             logger.error(f"Invalid property format at index {count}: {property_tuple}")
@@ -91,7 +101,7 @@ def generate_listing_pdf(self, sorted_properties, columns):
         # Constructing the details section directly from the property dictionary
         details = f"<para style='title'>Property Listing</para>"
         details += "".join(
-            f"<para style='heading'>{key.replace('_', ' ').title()}:</para> <para style='body'>{value}</para>"
+            f"{headings[key]} <para style='body'>{value}</para>"
             for key, value in property_dict.items()
             if key != "image_of_property"
         )
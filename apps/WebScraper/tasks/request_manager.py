@@ -2,8 +2,9 @@ import random
 import os
 import time
 import logging
+import threading
+from collections import deque
 import requests
-from bs4 import BeautifulSoup
 from django.conf import settings
 import json
 from scrapingant_client import (
@@ -11,7 +12,7 @@ from scrapingant_client import (
     ScrapingantClientException,
     ScrapingantInvalidInputException,
 )
-from lxml import html
+from lxml import etree, html
 from requests_html import HTMLSession
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry  # Corrected import
@@ -21,6 +22,17 @@ from .user_agents import get_user_agent
 # Proxy address from Django settings
 proxy_address = settings.PROXY_ADDRESS
 scraping_api_key = settings.SCRAPING_API_KEY
+listing_requests_per_minute = settings.LISTING_REQUESTS_PER_MINUTE
+
+# Listing links on a search results page, compiled once and matched in a single pass
+LISTING_LINK_XPATH = etree.XPath(
+    '//a[contains(@href, "realestateandhomes-detail")'
+    ' or contains(@href, "realestateandhomes-search")]/@href',
+    smart_strings=False,
+)
+
+# Encoded script ScrapingAnt runs on each results page: scroll to the bottom, then wait 2s
+SEARCH_JS_SNIPPET = "ZDJsdVpHOTNMbk5qY205c2JGUnZLREFzWkc5amRXMWxiblF1WW05a2VTNXpZM0p2Ykd4SVpXbG5hSFFwT3dwaGQyRnBkQ0J1WlhjZ1VISnZiV2x6WlNoeUlEMCtJSE5sZEZScGJXVnZkWFFvY2l3Z01qQXdNQ2twT3c9PQ=="
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -29,6 +41,30 @@ logging.basicConfig(
 )
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+# Successful listing fetches in the last minute, shared by every scraping thread in this worker
+_rate_limit_lock = threading.Lock()
+_listing_fetch_times = deque()
+
+
+# Block until another listing fetch fits in the per-minute budget
+def wait_for_listing_slot():
+    while True:
+        with _rate_limit_lock:
+            now = time.monotonic()
+            while _listing_fetch_times and now - _listing_fetch_times[0] >= 60:
+                _listing_fetch_times.popleft()
+            if len(_listing_fetch_times) < listing_requests_per_minute:
+                return
+            wait = 60 - (now - _listing_fetch_times[0])
+        time.sleep(wait)
+
+
+# Count a successful listing fetch against the per-minute budget
+def record_listing_fetch():
+    with _rate_limit_lock:
+        _listing_fetch_times.append(time.monotonic())
+
+
 
 
 
@@ -75,30 +111,21 @@ def make_listing_request(url):
     retries = 0
     max_retries = 3
     request_delay = random.uniform(1, 3)  # Random delay between requests
-    rate_limit = 5  # Maximum requests per minute
-    request_count = 0
-    start_time = time.time()
 
     while retries < max_retries:
-        if request_count >= rate_limit:
-            elapsed_time = time.time() - start_time
-            if elapsed_time < 60:
-                time.sleep(60 - elapsed_time)
-            request_count = 0
-            start_time = time.time()
-
         session = requests.Session()
         headers = get_random_headers()
         proxies = {"http": proxy_address, "https": proxy_address}
 
         logger.info(f"Scraping with headers: {headers}, proxies: {proxies}")
         time.sleep(request_delay)
+        wait_for_listing_slot()
 
         try:
             response = session.get(url, headers=headers, proxies=proxies, timeout=10)
             if response.status_code == 200:
                 logger.info("Scraped listing successfully.")
-                request_count += 1
+                record_listing_fetch()
                 return response
             else:
                 logger.info(
@@ -116,11 +143,11 @@ def make_listing_request(url):
 
 
 def make_search_request(url, max_pages=5, max_retries=3):
-    all_links = []
+    all_links = set()
+    client = ScrapingAntClient(token=scraping_api_key)
     for page in range(1, max_pages + 1):
         page_url = f"{url}/pg-{page}"
         retries = 0
-        client = ScrapingAntClient(token=scraping_api_key)
         time.sleep(random.uniform(1, 3))  # Add random delay between requests
         while retries < max_retries:
             headers = get_random_headers()
@@ -128,21 +155,13 @@ def make_search_request(url, max_pages=5, max_retries=3):
             time.sleep(random.uniform(1, 3))  # Add random delay between requests
 
             try:
-                js_snippet = "ZDJsdVpHOTNMbk5qY205c2JGUnZLREFzWkc5amRXMWxiblF1WW05a2VTNXpZM0p2Ykd4SVpXbG5hSFFwT3dwaGQyRnBkQ0J1WlhjZ1VISnZiV2x6WlNoeUlEMCtJSE5sZEZScGJXVnZkWFFvY2l3Z01qQXdNQ2twT3c9PQ=="
-
                 result = client.general_request(
-                    url=page_url, js_snippet=js_snippet, return_page_source=True
+                    url=page_url, js_snippet=SEARCH_JS_SNIPPET, return_page_source=True
                 )
 
                 if result and result.content:
-                    soup = BeautifulSoup(result.content, "html.parser")
-                    links = [
-                        listing["href"]
-                        for listing in soup.find_all("a", href=True)
-                        if "realestateandhomes-detail" in listing["href"]
-                        or "realestateandhomes-search" in listing["href"]
-                    ]
-                    all_links.extend(links)
+                    page_tree = html.fromstring(result.content)
+                    all_links.update(LISTING_LINK_XPATH(page_tree))
                 else:
                     logger.error(
                         f"No content received from ScrapingAnt API for page {page}"
@@ -158,8 +177,7 @@ def make_search_request(url, max_pages=5, max_retries=3):
             break
 
     base_url = "https://www.realtor.com"
-    unique_links = list(set(all_links))
     hyperlinks = [
-        base_url + link if link.startswith("/") else link for link in unique_links
+        base_url + link if link.startswith("/") else link for link in all_links
     ]
     return hyperlinks
@@ -1,7 +1,9 @@
 from celery import shared_task
 from celery_progress.backend import ProgressRecorder
+import json
 import logging
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import etree, html
 from .request_manager import make_listing_request, make_search_request
 from apps.WebScraper.models import PropertyListing
 
@@ -9,6 +11,23 @@ from apps.WebScraper.models import PropertyListing
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
+# Embedded Next.js payload holding the listing details
+NEXT_DATA_XPATH = etree.XPath('//script[@id="__NEXT_DATA__"]/text()', smart_strings=False)
+
+# Number of scraped listings queued before they are written
+LISTING_BATCH_SIZE = 100
+
+# Listing pages fetched at once; settings.LISTING_REQUESTS_PER_MINUTE caps the total rate
+MAX_SCRAPE_WORKERS = 5
+
+# Listing fields read from the mortgage estimate's monthly_payment_details, by position
+MONTHLY_PAYMENT_DETAIL_FIELDS = (
+    ("home_insurance", 1),
+    ("hoa_fees", 2),
+    ("mortgage_insurance", 3),
+    ("property_tax", 4),
+)
+
 @shared_task(bind=True)
 def scrape_website(self, scrape_config):
     progress_recorder = ProgressRecorder(self)
@@ -28,28 +47,64 @@ def scrape_website(self, scrape_config):
 
     if hyperlinks:
         count = 0
-        for count, hyperlink in enumerate(hyperlinks, 1):
-            new_listing = scrape_listings(hyperlink)
-            if new_listing:
-                PropertyListing.objects.create(**new_listing)
-                logger.info(f"Database updated with new listing from {hyperlink}.")
-            else:
-                logger.error(f"Failed to retrieve listing data from {hyperlink}")
+        pending_listings = []
+        try:
+            # Fetch listing pages concurrently; saving and progress stay on this thread
+            with ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS) as executor:
+                futures = {executor.submit(scrape_listings, hyperlink): hyperlink for hyperlink in hyperlinks}
+                try:
+                    for count, future in enumerate(as_completed(futures), 1):
+                        hyperlink = futures[future]
+                        new_listing = future.result()
+                        if new_listing:
+                            pending_listings.append(PropertyListing(**new_listing))
+                            logger.info(f"Queued new listing from {hyperlink}.")
+                            if len(pending_listings) >= LISTING_BATCH_SIZE:
+                                save_listings(pending_listings)
+                                pending_listings = []
+                        else:
+                            logger.error(f"Failed to retrieve listing data from {hyperlink}")
 
-            progress_recorder.set_progress(count, total_links, description=f"Gathering listings... ({count}/{total_links})")
+                        progress_recorder.set_progress(count, total_links, description=f"Gathering listings... ({count}/{total_links})")
+                except BaseException:
+                    # Don't let queued fetches keep hitting the site before the error surfaces
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            # Save finished listings even if the loop is cut short (e.g. a soft time limit)
+            if pending_listings:
+                save_listings(pending_listings)
 
         return {"status": "Scraping completed", "data": scrape_config}
     else:
         logger.info("No hyperlinks returned.")
         return {"status": "No hyperlinks found", "data": scrape_config}
 
+def save_listings(listings):
+    try:
+        PropertyListing.objects.bulk_create(listings)
+        logger.info(f"Database updated with {len(listings)} new listings.")
+    except Exception as e:
+        # Placeholder text in a numeric field fails the whole batch, so retry row by row
+        logger.error(f"Batch insert failed, saving listings individually: {str(e)}")
+        saved = 0
+        for listing in listings:
+            try:
+                listing.save()
+                saved += 1
+            except Exception as e:
+                logger.error(f"Failed to save listing from {listing.link}: {str(e)}")
+        logger.info(f"Database updated with {saved} new listings.")
+
 def scrape_listings(hyperlink):
     url = hyperlink
     try:
         response = make_listing_request(url)
         if response.status_code == 200:
-            listing_soup = BeautifulSoup(response.content, "html.parser")
-            script_content = listing_soup.select_one("#__NEXT_DATA__").text
+            # Decode as UTF-8 ourselves; given raw bytes, libxml2 falls back to Latin-1 without a meta charset
+            listing_tree = html.fromstring(response.content.decode("utf-8", errors="replace"))
+            script_content = NEXT_DATA_XPATH(listing_tree)[0]
             data_json = json.loads(script_content)
             return extract_listing_details(data_json, hyperlink)
         else:
@@ -65,7 +120,9 @@ def extract_listing_details(data_json, hyperlink):
         description = details.get("description", {})
         location = details.get("location", {})
         primary_photo = details.get("primary_photo", {})
-        return {
+        estimate = mortgage.get("estimate", {})
+        payment_details = estimate.get("monthly_payment_details", [{}])
+        listing = {
             "link": hyperlink,
             "address": location.get("address", {}).get("line", "Unknown Address"),
             "image_of_property": primary_photo.get("href", "No image available"),
@@ -81,12 +138,11 @@ def extract_listing_details(data_json, hyperlink):
             "garage": description.get("garage", "Garage details not specified"),
             "year_built": description.get("year_built", "Year not specified"),
             "time_on_market": details.get("days_on_market", "Time on market not specified"),
-            "estimated_monthly_payment": mortgage.get("estimate", {}).get("monthly_payment", "Not specified"),
-            "home_insurance": mortgage.get("estimate", {}).get("monthly_payment_details", [{}])[1].get("amount", "Not specified"),
-            "hoa_fees": mortgage.get("estimate", {}).get("monthly_payment_details", [{}])[2].get("amount", "Not specified"),
-            "mortgage_insurance": mortgage.get("estimate", {}).get("monthly_payment_details", [{}])[3].get("amount", "Not specified"),
-            "property_tax": mortgage.get("estimate", {}).get("monthly_payment_details", [{}])[4].get("amount", "Not specified"),
+            "estimated_monthly_payment": estimate.get("monthly_payment", "Not specified"),
         }
+        for field, index in MONTHLY_PAYMENT_DETAIL_FIELDS:
+            listing[field] = payment_details[index].get("amount", "Not specified")
+        return listing
     except KeyError as e:
         logger.error(f"Key error in data extraction for hyperlink {hyperlink}: {str(e)}")
         return None
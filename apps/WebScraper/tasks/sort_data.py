@@ -1,8 +1,5 @@
 import logging
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
+import xlsxwriter
 from celery import shared_task
 from apps.KeywordSelection.models import Keyword
 from apps.WebScraper.models import PropertyListing
@@ -15,11 +12,14 @@ logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+# Rows fetched per database round-trip when streaming listings
+LISTING_CHUNK_SIZE = 2000
+
 
 def fetch_property_listings():
     logger.debug("Fetching property listings based on priority")
     keywords = Keyword.objects.exclude(priority=0).order_by("-priority")
-    priority_columns = [(keyword.listing_field, keyword.name) for keyword in keywords]
+    priority_columns = list(keywords.values_list("listing_field", "name"))
     priority_fields = [field for field, _ in priority_columns]
 
     all_fields = {field.name for field in PropertyListing._meta.get_fields()}
@@ -32,79 +32,48 @@ def fetch_property_listings():
         ]  # Safeguard against None fields
 
     listings = PropertyListing.objects.values_list(*fields, named=True)
-    logger.debug(f"Fetched {len(listings)} listings with fields: {fields}")
+    logger.debug(f"Fetching listings with fields: {fields}")
     return [(field, field) for field in fields], listings
 
 
 def generate_spreadsheet(columns, listings):
     logger.info("Generating spreadsheet for property listings")
-    df = pd.DataFrame(list(listings), columns=[name for _, name in columns])
-    wb = Workbook()
-    ws = wb.active
-    header_font = Font(bold=True, color="FFFFFF")
-    cell_border = Border(
-        left=Side(style="thin"),
-        right=Side(style="thin"),
-        top=Side(style="thin"),
-        bottom=Side(style="thin"),
-    )
-    header_fill = PatternFill(
-        start_color="4F81BD", end_color="4F81BD", fill_type="solid"
-    )
-
-    for col_num, header in enumerate(df.columns, 1):
-        cell = ws.cell(row=1, column=col_num, value=header)
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center")
-        cell.border = cell_border
-        cell.fill = header_fill
-
-    for row in dataframe_to_rows(df, index=False, header=False):
-        ws.append(row)
-
-    for column in ws.columns:
-        max_length = max(len(str(cell.value)) for cell in column) + 2
-        ws.column_dimensions[column[0].column_letter].width = max_length
-
+    headers = [name for _, name in columns]
     filename = "PropertyListings.xlsx"
-    wb.save(filename)
+    # constant_memory streams each finished row to disk instead of holding the sheet in RAM
+    with xlsxwriter.Workbook(
+        filename, {"constant_memory": True, "strings_to_urls": False}
+    ) as wb:
+        ws = wb.add_worksheet("Sheet")
+        header_format = wb.add_format(
+            {
+                "bold": True,
+                "font_color": "#FFFFFF",
+                "align": "center",
+                "border": 1,
+                "bg_color": "#4F81BD",
+                "pattern": 1,
+            }
+        )
+
+        ws.write_row(0, 0, headers, header_format)
+        column_widths = [len(str(header)) for header in headers]
+
+        for row_num, row in enumerate(listings, 1):
+            ws.write_row(row_num, 0, row)
+            for col_num, value in enumerate(row):
+                column_widths[col_num] = max(column_widths[col_num], len(str(value)))
+
+        for col_num, width in enumerate(column_widths):
+            ws.set_column(col_num, col_num, width + 2)
+
     logger.info(f"Spreadsheet saved to {filename}")
     return "Spreadsheet generated successfully!"
 
 
-def quick_sort(arr, compare_func):
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[0]
-    less = [x for x in arr[1:] if compare_func(x, pivot) < 0]
-    greater = [x for x in arr[1:] if compare_func(x, pivot) >= 0]
-    return quick_sort(less, compare_func) + [pivot] + quick_sort(greater, compare_func)
-
-
-def compare_properties(x, y, user_preferences, priority_fields):
-    score_x, score_y = 0, 0
-
-    def compare_range_or_max(x_attr, y_attr, pref_min, pref_max, is_max=False):
-        nonlocal score_x, score_y
-        value_min = float(pref_min) if pref_min else float("-inf")
-        value_max = float(pref_max) if pref_max else float("inf")
-        if not is_max:
-            if value_min <= getattr(x, x_attr) <= value_max:
-                score_x += 1
-            if value_min <= getattr(y, y_attr) <= value_max:
-                score_y += 1
-        else:
-            if getattr(x, x_attr) <= value_max:
-                score_x += 1
-            if getattr(y, y_attr) <= value_max:
-                score_y += 1
-
-    def compare_exact(x_attr, y_attr, preference):
-        nonlocal score_x, score_y
-        if getattr(x, x_attr) == preference:
-            score_x += 1
-        if getattr(y, y_attr) == preference:
-            score_y += 1
+def build_preference_checks(user_preferences, priority_fields):
+    """Parse the user's preferences once into range and exact-match checks."""
+    range_checks, exact_checks = [], []
 
     for field in priority_fields:
         pref_min = user_preferences.get(f"{field}_min", None)
@@ -112,11 +81,30 @@ def compare_properties(x, y, user_preferences, priority_fields):
         is_max = "+" in str(pref_max) if pref_max else False
 
         if pref_min or pref_max:
-            compare_range_or_max(field, field, pref_min, pref_max, is_max)
+            value_min = float(pref_min) if pref_min else float("-inf")
+            value_max = float(pref_max) if pref_max else float("inf")
+            if is_max:
+                value_min = float("-inf")
+            range_checks.append((field, value_min, value_max))
         elif user_preferences.get(field):
-            compare_exact(field, field, user_preferences[field])
+            exact_checks.append((field, user_preferences[field]))
+
+    return range_checks, exact_checks
+
+
+def score_property(listing, preference_checks):
+    """Count how many of the user's preferences a listing satisfies."""
+    range_checks, exact_checks = preference_checks
+    score = 0
+
+    for field, value_min, value_max in range_checks:
+        if value_min <= getattr(listing, field) <= value_max:
+            score += 1
+    for field, preference in exact_checks:
+        if getattr(listing, field) == preference:
+            score += 1
 
-    return score_x - score_y
+    return score
 
 
 @shared_task(bind=True)
@@ -132,12 +120,15 @@ def generate_sorted_properties(self, scrape_config):
 
     priority_fields = [col[0] for col in columns if col[0] != "link"]
     logger.debug(f"Sorting properties based on user preferences: {scrape_config}")
-    sorted_properties = quick_sort(
-        listings, lambda x, y: compare_properties(x, y, scrape_config, priority_fields)
+    preference_checks = build_preference_checks(scrape_config, priority_fields)
+    # Stream rows into sorted() so the queryset does not also cache every row
+    sorted_properties = sorted(
+        listings.iterator(chunk_size=LISTING_CHUNK_SIZE),
+        key=lambda listing: score_property(listing, preference_checks),
     )
     progress_recorder.set_progress(35, 100, description="Sorted properties")
 
-    logger.info("Sorted properties, generating spreadsheet")
+    logger.info(f"Sorted {len(sorted_properties)} properties, generating spreadsheet")
     generate_spreadsheet(columns, sorted_properties)
     progress_recorder.set_progress(45, 100, description="Generated spreadsheet")
 
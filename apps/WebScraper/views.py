@@ -28,6 +28,12 @@ logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+# Strips currency symbols and units from range labels such as "$100,000" or "500 sqft."
+NON_NUMERIC_RE = re.compile(r"[^\d.]+")
+
+# Denominator for every pipeline progress update
+PROGRESS_TOTAL = Decimal(100)
+
 
 @shared_task(bind=True)
 def start_processing_pipeline(self, scrape_config, user_email=None):
@@ -65,16 +71,15 @@ def update_progress(task_id, progress, description, result):
     try:
         # Ensure progress is a valid numeric value
         current_progress = Decimal(str(progress))
-        total = Decimal(100)
 
         # Update the progress
-        progress_recorder.set_progress(current_progress, total, description=description)
+        progress_recorder.set_progress(current_progress, PROGRESS_TOTAL, description=description)
     except InvalidOperation as e:
         logger.error(f"InvalidOperation error while converting progress to Decimal: {e}")
-        progress_recorder.set_progress(0, Decimal(100), description="Error: Invalid progress value.")
+        progress_recorder.set_progress(0, PROGRESS_TOTAL, description="Error: Invalid progress value.")
     except TypeError as e:
         logger.error(f"TypeError while updating progress: {e}")
-        progress_recorder.set_progress(0, Decimal(100), description="Error: Progress update failed.")
+        progress_recorder.set_progress(0, PROGRESS_TOTAL, description="Error: Progress update failed.")
 
     return result
 
@@ -197,7 +202,7 @@ def create_field_data(keyword):
         elif "range" in extra_data:
             field_data["options"] = sorted(
                 extra_data["range"],
-                key=lambda x: float(re.sub(r"[^\d.]+", "", x).strip() or 0),
+                key=lambda x: float(NON_NUMERIC_RE.sub("", x).strip() or 0),
             )
             field_data["type"] = "range_select"
 
@@ -165,3 +165,6 @@ PROXY_ADDRESS = config("PROXY_ADDRESS")
 
 # API Key
 SCRAPING_API_KEY = config("SCRAPING_API_KEY")
+
+# Successful listing fetches allowed per minute across the scraper's worker threads
+LISTING_REQUESTS_PER_MINUTE = config("LISTING_REQUESTS_PER_MINUTE", default=60, cast=int)